@@ -15,35 +15,57 @@ Author: Deviance
 License: MIT
 """
 
+import http.client
 import http.server
 import socketserver
 import urllib.request
 import urllib.error
-import json
+import urllib.parse
 import sys
 import time
 import logging
 import argparse
 import os
 import subprocess
+import tempfile
+import queue
+import random
 import re
+import threading
 import colorama
-import paramiko
+import orjson
+from contextlib import contextmanager
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
-from socket import socket, AF_INET, SOCK_STREAM
+import socket as socket_module
+from socket import socket, create_connection, AF_INET, SOCK_STREAM, SOL_SOCKET
+
+SO_REUSEPORT: Optional[int] = getattr(socket_module, "SO_REUSEPORT", None)  # Not available on Windows
+HAS_UNIX_SOCKETS = hasattr(socket_module, "AF_UNIX") and sys.platform != 'win32'
 
 # Configure logging with cleaner output and colors
 colorama.init()
 
 # Color constants
 class Colors:
-    HEADER = '\033[95m'
-    BLUE = '\033[94m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
+    HEADER: ClassVar[str] = '\033[95m'
+    BLUE: ClassVar[str] = '\033[94m'
+    GREEN: ClassVar[str] = '\033[92m'
+    YELLOW: ClassVar[str] = '\033[93m'
+    RED: ClassVar[str] = '\033[91m'
+    ENDC: ClassVar[str] = '\033[0m'
+    BOLD: ClassVar[str] = '\033[1m'
+
+# Piped or redirected output gets plain text; done before any colored template is built
+if not (sys.stdout and sys.stdout.isatty()):
+    for _name in ('HEADER', 'BLUE', 'GREEN', 'YELLOW', 'RED', 'ENDC', 'BOLD'):
+        setattr(Colors, _name, '')
+
+
+def bold(text):
+    """Wrap text in the bold color codes"""
+    return f"{Colors.BOLD}{text}{Colors.ENDC}"
 
 logging.basicConfig(
     level=logging.INFO,
@@ -52,8 +74,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger('dcopt')
 
+
+def _dumps(obj, indent=False):
+    """Serialize obj to a JSON string using orjson"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+
+
+_loads = orjson.loads
+
+# SSE envelope for a streamed token, split around the content so the constant parts
+# are rendered once per request and only the token itself is JSON-escaped
+_SSE_CONTENT_PREFIX_TMPL = (
+    b'data: {"id":"%s","object":"chat.completion.chunk","created":%d,"model":%s,'
+    b'"choices":[{"index":0,"delta":{"content":'
+)
+_SSE_CONTENT_SUFFIX = b'},"finish_reason":null}]}\n\n'
+
+# Pre-encoded bodies for fixed-shape responses
+_HEALTH_BODY = orjson.dumps({
+    "status": "ok",
+    "version": "v1",
+    "message": "Ollama proxy is running"
+})
+_HEALTH_HEADERS = (('Content-Type', 'application/json'), ('Content-Length', str(len(_HEALTH_BODY))))
+
+# Static GET responses as (status, headers, body); these paths are served without logging
+_STATIC_RESPONSES = {
+    '/': (200, _HEALTH_HEADERS, _HEALTH_BODY),
+    '/v1': (200, _HEALTH_HEADERS, _HEALTH_BODY),
+    '/favicon.ico': (204, (), b''),
+}
+_NOLOG_PATHS = frozenset(_STATIC_RESPONSES)
+_ERROR_TMPL = b'{"error":{"message":%s,"type":"%s","code":%d}}'
+
+# OpenAI-compatible endpoints translated to Ollama's /api/generate
+_CHAT_PATHS = frozenset(('/chat/completions', '/v1/chat/completions'))
+
+# Prompt templates per chat role; other roles pass their content through unchanged
+_ROLE_TMPL = {
+    "system": "[INST]<<SYS>>{}<</SYS>>[/INST]",
+    "user": "[INST]{}[/INST]",
+}
+
+# Response cleanup patterns: HTML-style tags, then leftover prompt-template markers
+_TAG_RE = re.compile(r'<[^>]+>')
+_MARKERS_RE = re.compile(r'\[/?INST\]|<</?SYS>>|</s>')
+
 # Configuration
-CONFIG = {
+CONFIG: Dict[str, Any] = {
     "ollama_url": "http://127.0.0.1:11434",  # Ollama URL
     "proxy_port": 11435,                      # Proxy port
     "model_name": "deepseek-r1:7b",          # Default model
@@ -63,8 +131,11 @@ CONFIG = {
     "ngrok_authtoken": "",                    # Your ngrok auth token
     "request_timeout": 300,                   # Request timeout in seconds (5 minutes)
     "max_buffer_size": 1024 * 1024 * 1000,   # 50MB buffer for large responses
-    "chunk_size": 16384,                      # 16KB chunks for streaming
+    "chunk_size": 65536,                      # 64KB chunks for streaming
     "max_retries_on_timeout": 2,              # Additional retries on timeout
+    "max_workers": 16,                        # Proxy worker threads handling client connections
+    "thread_stack_size": 512 * 1024,          # Stack per thread; handlers never recurse deeply
+    "reuse_port": False,                      # Set SO_REUSEPORT so several proxies can share the port
     "use_ssh": False,                         # Enable SSH tunneling
     "ssh_host": "",                           # SSH host to connect to
     "ssh_port": 22,                           # SSH port
@@ -72,211 +143,334 @@ CONFIG = {
     "ssh_password": "",                       # SSH password
     "ssh_key_file": "",                       # SSH private key file (optional)
     "ssh_remote_port": 11435,                 # Remote port to forward to (same as proxy_port)
+    "uds_path": None,                         # Unix socket the SSH tunnel forwards into (set at runtime)
+    "start_ollama": False,                    # Start Ollama if needed, and restart it if it goes away
+    "ollama_healthy": True,                   # Cleared when Ollama refuses a proxied request
 }
 
 
+def _backoff(attempt, base=0.1, cap=2.0):
+    """Truncated exponential backoff delay with jitter for the given retry attempt"""
+    return min(cap, base * 2 ** attempt) * (0.5 + random.random())
+
+
+# Per-thread keep-alive connection to Ollama; ProxyServer workers are long-lived so each keeps its socket
+_upstream = threading.local()
+
+
+def _ollama_connection():
+    """Return this thread's connection to Ollama, opening it on first use"""
+    conn = getattr(_upstream, "conn", None)
+    if conn is None:
+        url = urllib.parse.urlsplit(CONFIG["ollama_url"])
+        conn_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        conn = conn_class(url.hostname, url.port, timeout=CONFIG["request_timeout"])
+        _upstream.conn = conn
+    return conn
+
+
+def _drop_ollama_connection():
+    """Close and forget this thread's Ollama connection"""
+    conn = getattr(_upstream, "conn", None)
+    if conn is not None:
+        conn.close()
+        _upstream.conn = None
+
+
+_ollama_seen_at: Optional[float] = None  # monotonic time of the last successful health probe
+_recovering = threading.Lock()  # Held while a background restart of Ollama is running
+
+
+def _ollama_refused():
+    """Record that Ollama refused a connection and restart it if we are allowed to
+
+    Requests are never preceded by a health probe; a refused connection is the signal.
+    """
+    global _ollama_seen_at
+    _ollama_seen_at = None  # Don't let a cached probe claim Ollama is still up
+    if CONFIG["ollama_healthy"]:
+        CONFIG["ollama_healthy"] = False
+        logger.warning("Ollama refused the connection; marking it as down")
+    if CONFIG["start_ollama"] and _recovering.acquire(blocking=False):
+        Thread(target=_recover_ollama, daemon=True).start()
+
+
+def _recover_ollama():
+    """Restart Ollama in the background and mark it healthy once it answers"""
+    try:
+        if start_ollama():
+            CONFIG["ollama_healthy"] = True
+    finally:
+        _recovering.release()
+
+
+@contextmanager
+def _ollama_request(method: str, path: str, body: Union[bytes, bytearray, None] = None) -> Iterator[http.client.HTTPResponse]:
+    """Send a request to Ollama over the keep-alive connection and yield the response
+
+    The connection is only reused if the caller reads the response to the end;
+    otherwise it is dropped so leftover bytes can't leak into the next request.
+    """
+    # HTTP/1.1 keeps the socket open by default; stated explicitly for proxies in between
+    headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+    retries = CONFIG["retry_count"]
+    for attempt in range(retries + 1):
+        conn = _ollama_connection()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            break
+        except (http.client.BadStatusLine, ConnectionError) as e:
+            _drop_ollama_connection()
+            if attempt == retries:
+                if isinstance(e, ConnectionRefusedError):
+                    _ollama_refused()
+                raise
+            # A stale keep-alive socket is retried immediately; a real outage backs off
+            if attempt:
+                logger.warning(f"Ollama connection failed ({e}), retrying...")
+                time.sleep(_backoff(attempt - 1, base=CONFIG["retry_delay"]))
+        except Exception:
+            _drop_ollama_connection()
+            raise
+    if not CONFIG["ollama_healthy"]:
+        CONFIG["ollama_healthy"] = True
+        logger.info("✓ Ollama is reachable again")
+    try:
+        yield response
+    finally:
+        if response.length == 0:
+            response.close()  # read1() leaves a fully read Content-Length body open
+        if not response.isclosed():
+            _drop_ollama_connection()
+
+
+def _iter_ndjson(response: http.client.HTTPResponse, chunk_size: int) -> Iterator[List[Any]]:
+    """Yield the NDJSON records decoded from each upstream read, one list per read
+
+    read1 returns as soon as Ollama flushes a chunk instead of waiting for chunk_size
+    bytes. Complete lines are walked with a cursor and decoded straight from a view
+    of one persistent buffer, which is compacted once per read. Grouping records by
+    read lets the caller batch its writes to the client.
+    """
+    buffer = bytearray()
+    while True:
+        chunk = response.read1(chunk_size)
+        if not chunk:
+            return
+        buffer.extend(chunk)
+
+        records = []
+        view = memoryview(buffer)
+        start = 0
+        idx = buffer.find(b'\n')
+        while idx != -1:
+            line_start, line_end = start, idx
+            start = idx + 1
+            idx = buffer.find(b'\n', start)
+            if line_end > line_start:
+                try:
+                    records.append(_loads(view[line_start:line_end]))
+                except orjson.JSONDecodeError:
+                    continue
+        view.release()
+        del buffer[:start]
+        yield records
+
 
 class CORSProxyHandler(http.server.BaseHTTPRequestHandler):
     """HTTP request handler with CORS, streaming, and console logging"""
 
-    def log_request(self, code='-', size='-'):
+    def log_request(self, code: Union[int, str] = '-', size: Union[int, str] = '-') -> None:
         """Override to provide minimal request logging"""
-        if self.path not in ['/', '/v1', '/favicon.ico']:  # Skip logging for common endpoints
+        if self.path not in _NOLOG_PATHS:  # Skip logging for common endpoints
             logger.debug(f"Request: {self.command} {self.path} {code}")
 
-    def do_OPTIONS(self):
+    def do_OPTIONS(self) -> None:
         """Handle CORS preflight"""
         self.send_response(200)
         self.send_cors_headers()
         self.end_headers()
 
-    def do_GET(self):
+    def do_GET(self) -> None:
         """Handle GET requests"""
-        logger.info(f"\n=== GET Request to {self.path} ===")
-        
-        # Handle root endpoint
-        if self.path == "/" or self.path == "/v1":
-            self.send_response(200)
-            self.send_cors_headers()
-            self.send_header('Content-Type', 'application/json')
-            response = {
-                "status": "ok",
-                "version": "v1",
-                "message": "Ollama proxy is running"
-            }
-            response_json = json.dumps(response)
-            self.send_header('Content-Length', str(len(response_json.encode('utf-8'))))
-            self.end_headers()
-            self.wfile.write(response_json.encode('utf-8'))
-            self.wfile.flush()
+        # Health checks and favicon are polled constantly; answer them before any logging
+        if self.path in _NOLOG_PATHS:
+            self._send_static(self.path)
             return
-            
+
+        logger.info(f"\n=== GET Request to {self.path} ===")
+
         # Handle models endpoint
-        elif self.path == '/v1/models':
+        if self.path == '/v1/models':
             try:
-                result = subprocess.run(["ollama", "list"], capture_output=True, text=True, shell=True)
-                logger.info(f"Ollama list output: {result.stdout}")
-                models = []
-                if result.returncode == 0:
-                    for line in result.stdout.splitlines()[1:]:  # Skip header
-                        if line.strip():
-                            model_name = line.split()[0]
-                            models.append({
-                                "id": model_name,
-                                "object": "model",
-                                "created": int(time.time()),
-                                "owned_by": "ollama"
-                            })
-                
+                created = int(time.time())
+                models = [
+                    {
+                        "id": model_name,
+                        "object": "model",
+                        "created": created,
+                        "owned_by": "ollama"
+                    }
+                    for model_name in _get_models_cached()
+                ]
+
                 response = {
                     "object": "list",
                     "data": models
                 }
                 
-                response_json = json.dumps(response)
-                logger.info(f"Sending response: {response_json}")
-                
-                self.send_response(200)
-                self.send_cors_headers()
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(len(response_json.encode('utf-8'))))
-                self.end_headers()
-                
-                self.wfile.write(response_json.encode('utf-8'))
-                self.wfile.flush()
+                body = orjson.dumps(response)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Sending response: {body.decode('utf-8')}")
+
+                self._send_json(200, body)
+            except ConnectionRefusedError:
+                self._send_error(503, "Ollama is not running", "service_unavailable")
             except Exception as e:
                 logger.error(f"Error getting model list: {e}")
-                error_response = {
-                    "error": {
-                        "message": f"Failed to get model list: {str(e)}",
-                        "type": "server_error",
-                        "code": 500
-                    }
-                }
-                error_json = json.dumps(error_response)
-                self.send_response(500)
-                self.send_cors_headers()
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Content-Length', str(len(error_json.encode('utf-8'))))
-                self.end_headers()
-                self.wfile.write(error_json.encode('utf-8'))
-                self.wfile.flush()
+                self._send_error(500, f"Failed to get model list: {str(e)}", "server_error")
             return
         
-        # Handle favicon.ico
-        elif self.path == '/favicon.ico':
-            self.send_response(204)  # No content
-            self.end_headers()
-            return
-            
         # All other endpoints
         else:
             logger.info(f"Unhandled GET path: {self.path}")
-            error_response = {
-                "error": {
-                    "message": f"Endpoint not found: {self.path}",
-                    "type": "not_found",
-                    "code": 404
-                }
-            }
-            error_json = json.dumps(error_response)
-            self.send_response(404)
-            self.send_cors_headers()
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Content-Length', str(len(error_json.encode('utf-8'))))
-            self.end_headers()
-            self.wfile.write(error_json.encode('utf-8'))
-            self.wfile.flush()
+            self._send_error(404, f"Endpoint not found: {self.path}", "not_found")
 
-    def do_POST(self):
+    def do_POST(self) -> None:
         """Handle POST requests"""
         logger.info("\n=== Cursor POST Request ===")
         logger.info(f"Path: {self.path}")
-        logger.info(f"Headers: {dict(self.headers)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Headers: {dict(self.headers)}")
         self.proxy_request("POST")
 
-    def send_cors_headers(self):
+    def send_cors_headers(self) -> None:
         """Add CORS headers"""
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS, GET")
         self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
 
-    def proxy_request(self, method):
+    def _send_json(self, code: int, body: bytes) -> None:
+        """Send an already-encoded JSON body with CORS headers"""
+        self.send_response(code)
+        self.send_cors_headers()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+
+    def _send_static(self, path: str) -> None:
+        """Send one of the precomputed static responses"""
+        status, headers, body = _STATIC_RESPONSES[path]
+        self.send_response(status)
+        self.send_cors_headers()
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+            self.wfile.flush()
+
+    def _send_error(self, code: int, message: str, error_type: str) -> None:
+        """Send an OpenAI-style error response built from the cached template"""
+        self._send_json(code, _ERROR_TMPL % (orjson.dumps(message), error_type.encode('utf-8'), code))
+
+    def read_body(self, content_length: int) -> bytearray:
+        """Read the request body straight into a buffer sized by Content-Length"""
+        body = bytearray(content_length)
+        view = memoryview(body)
+        got = 0
+        while got < content_length:
+            n = self.rfile.readinto(view[got:])
+            if not n:
+                break
+            got += n
+        view.release()
+        if got < content_length:
+            del body[got:]  # Client closed early; keep what arrived
+        return body
+
+    def passthrough_request(self, method: str, path: str, body: Union[bytes, bytearray, None]) -> None:
+        """Forward a request to Ollama and relay the response without parsing it"""
+        with _ollama_request(method, path, body) as response:
+            self.send_response(response.status)
+            self.send_cors_headers()
+            for header in ('Content-Type', 'Content-Length'):
+                value = response.headers.get(header)
+                if value is not None:
+                    self.send_header(header, value)
+            self.end_headers()
+            # read1 keeps native streaming endpoints (e.g. /api/pull) incremental
+            while True:
+                chunk = response.read1(CONFIG["chunk_size"])
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                self.wfile.flush()
+
+    def proxy_request(self, method: str) -> None:
         """Proxy request to Ollama with streaming support"""
-        target_url = CONFIG["ollama_url"] + "/api/generate" if self.path in ['/chat/completions', '/v1/chat/completions'] else CONFIG["ollama_url"] + self.path
+        is_chat = self.path in _CHAT_PATHS
+        target_path = "/api/generate" if is_chat else self.path
 
         try:
             content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length) if content_length > 0 else None
+            body: Union[bytes, bytearray, None] = self.read_body(content_length) if content_length > 0 else None
+
+            # Native Ollama endpoints need no translation, so pipe bytes straight through
+            if not is_chat:
+                self.passthrough_request(method, target_path, body)
+                return
 
             if method == 'POST' and body:
                 try:
-                    body_json = json.loads(body)
-                    logger.info("\n=== Request Body ===")
-                    logger.info(json.dumps(body_json, indent=2))
-                    logger.info("===================")
-
-                    if self.path in ['/chat/completions', '/v1/chat/completions']:
-                        messages = body_json.get("messages", [])
-                        stream = body_json.get("stream", False)
-                        
-                        # Convert GPT model names to default model
-                        requested_model = body_json.get("model", CONFIG["model_name"])
-                        if requested_model.startswith(("gpt-3", "gpt-4")):
-                            model = CONFIG["model_name"]
-                            logger.info(f"Converting {requested_model} to {model}")
-                        else:
-                            model = requested_model
-                        
-                        prompt_parts = []
-                        for msg in messages:
-                            content = msg.get('content', '')
-                            role = msg.get('role', '')
-                            if role == "system":
-                                prompt_parts.append(f"[INST]<<SYS>>{content}<</SYS>>[/INST]")
-                            elif role == "user":
-                                prompt_parts.append(f"[INST]{content}[/INST]")
-                            else:
-                                prompt_parts.append(content)
-                        
-                        ollama_request = {
-                            "model": model,
-                            "prompt": "\n".join(prompt_parts),
-                            "stream": stream,
-                            "options": {
-                                "temperature": body_json.get("temperature", 0.7),
-                                "top_p": body_json.get("top_p", 1.0),
-                                "num_predict": body_json.get("max_tokens", 4096),
-                                "stop": body_json.get("stop", ["[INST]", "</s>"]) if isinstance(body_json.get("stop"), list) else ["[INST]", "</s>"]
-                            }
-                        }
-                        logger.info("\n=== Transformed Request ===")
-                        logger.info(json.dumps(ollama_request, indent=2))
-                        logger.info("========================")
-                        body = json.dumps(ollama_request).encode('utf-8')
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON in request: {e}")
-                    error_response = {
-                        "error": {
-                            "message": f"Invalid JSON in request: {str(e)}",
-                            "type": "invalid_request_error",
-                            "code": 400
+                    body_json = _loads(body)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"\n=== Request Body ===\n{_dumps(body_json, indent=True)}\n===================")
+
+                    messages = body_json.get("messages", [])
+                    stream = body_json.get("stream", False)
+
+                    # Convert GPT model names to default model
+                    requested_model = body_json.get("model", CONFIG["model_name"])
+                    if requested_model.startswith(("gpt-3", "gpt-4")):
+                        model = CONFIG["model_name"]
+                        logger.info(f"Converting {requested_model} to {model}")
+                    else:
+                        model = requested_model
+
+                    prompt = "\n".join(
+                        _ROLE_TMPL.get(msg.get('role', ''), "{}").format(msg.get('content', ''))
+                        for msg in messages
+                    )
+
+                    ollama_request = {
+                        "model": model,
+                        "prompt": prompt,
+                        "stream": stream,
+                        "options": {
+                            "temperature": body_json.get("temperature", 0.7),
+                            "top_p": body_json.get("top_p", 1.0),
+                            "num_predict": body_json.get("max_tokens", 4096),
+                            "stop": body_json.get("stop", ["[INST]", "</s>"]) if isinstance(body_json.get("stop"), list) else ["[INST]", "</s>"]
                         }
                     }
-                    self.send_response(400)
-                    self.send_cors_headers()
-                    self.send_header('Content-Type', 'application/json')
-                    error_json = json.dumps(error_response)
-                    self.send_header('Content-Length', str(len(error_json.encode('utf-8'))))
-                    self.end_headers()
-                    self.wfile.write(error_json.encode('utf-8'))
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"\n=== Transformed Request ===\n{_dumps(ollama_request, indent=True)}\n========================")
+                    body = orjson.dumps(ollama_request)
+                except orjson.JSONDecodeError as e:
+                    logger.error(f"Invalid JSON in request: {e}")
+                    self._send_error(400, f"Invalid JSON in request: {str(e)}", "invalid_request_error")
                     return
 
-            headers = {'Content-Type': 'application/json'}
-            request = urllib.request.Request(target_url, data=body, headers=headers, method=method)
-            
-            with urllib.request.urlopen(request, timeout=CONFIG["request_timeout"]) as response:
-                if self.path in ['/chat/completions', '/v1/chat/completions'] and body_json.get("stream", False):
+            with _ollama_request(method, target_path, body) as response:
+                if response.status >= 400:
+                    error_body = response.read()
+                    logger.error(f"\n=== Ollama Error ===\nStatus: {response.status}\nResponse: {error_body!r}\n==================")
+                    self._send_error(500, f"Proxy error: HTTP Error {response.status}: {response.reason}", "server_error")
+                elif body_json.get("stream", False):
                     self.send_response(200)
                     self.send_header('Content-Type', 'text/event-stream')
                     self.send_header('Cache-Control', 'no-cache')
@@ -295,64 +489,52 @@ class CORSProxyHandler(http.server.BaseHTTPRequestHandler):
                         'model': model,
                         'choices': [{'index': 0, 'delta': {'role': 'assistant'}, 'finish_reason': None}]
                     }
-                    logger.info("\n=== Initial Chunk ===")
-                    logger.info(json.dumps(initial_chunk, indent=2))
-                    logger.info("===================")
-                    self.wfile.write(f"data: {json.dumps(initial_chunk)}\n\n".encode('utf-8'))
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"\n=== Initial Chunk ===\n{_dumps(initial_chunk, indent=True)}\n===================")
+                    self.wfile.write(b"data: " + orjson.dumps(initial_chunk) + b"\n\n")
                     self.wfile.flush()
 
-                    buffer = ""
-                    while True:
-                        chunk = response.read(CONFIG["chunk_size"]).decode('utf-8')
-                        if not chunk:
-                            break
-                        buffer += chunk
-                        
-                        while '\n' in buffer:
-                            line, buffer = buffer.split('\n', 1)
-                            if line.strip():
-                                try:
-                                    data = json.loads(line)
-                                    if 'response' in data:
-                                        event_data = {
-                                            'id': completion_id,
-                                            'object': 'chat.completion.chunk',
-                                            'created': created,
-                                            'model': model,
-                                            'choices': [{'index': 0, 'delta': {'content': data['response']}, 'finish_reason': None}]
-                                        }
-                                        logger.info(f"Streaming chunk: {data['response']}")
-                                        self.wfile.write(f"data: {json.dumps(event_data)}\n\n".encode('utf-8'))
-                                        self.wfile.flush()
-                                    if data.get('done'):
-                                        final_chunk = {
-                                            'id': completion_id,
-                                            'object': 'chat.completion.chunk',
-                                            'created': created,
-                                            'model': model,
-                                            'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]
-                                        }
-                                        logger.info("\n=== Final Chunk ===")
-                                        logger.info(json.dumps(final_chunk, indent=2))
-                                        logger.info("==================")
-                                        self.wfile.write(f"data: {json.dumps(final_chunk)}\n\n".encode('utf-8'))
-                                        self.wfile.write(b"data: [DONE]\n\n")
-                                        self.wfile.flush()
-                                        return
-                                except json.JSONDecodeError:
-                                    continue
+                    content_prefix = _SSE_CONTENT_PREFIX_TMPL % (completion_id.encode('utf-8'), created, orjson.dumps(model))
+                    events = bytearray()  # SSE events decoded from one upstream read, sent with a single write
+                    for records in _iter_ndjson(response, CONFIG["chunk_size"]):
+                        for data in records:
+                            if 'response' in data:
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    logger.debug(f"Streaming chunk: {data['response']}")
+                                events += content_prefix
+                                events += orjson.dumps(data['response'])
+                                events += _SSE_CONTENT_SUFFIX
+                            if data.get('done'):
+                                final_chunk = {
+                                    'id': completion_id,
+                                    'object': 'chat.completion.chunk',
+                                    'created': created,
+                                    'model': model,
+                                    'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]
+                                }
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    logger.debug(f"\n=== Final Chunk ===\n{_dumps(final_chunk, indent=True)}\n==================")
+                                events += b"data: " + orjson.dumps(final_chunk) + b"\n\ndata: [DONE]\n\n"
+                                self.wfile.write(events)
+                                self.wfile.flush()
+                                response.read()  # Consume the chunked terminator so the connection can be reused
+                                return
+
+                        if events:
+                            self.wfile.write(events)
+                            self.wfile.flush()
+                            events.clear()
                 else:
                     response_body = response.read()
                     try:
-                        ollama_response = json.loads(response_body)
-                        logger.info("\n=== Ollama Response ===")
-                        logger.info(json.dumps(ollama_response, indent=2))
-                        logger.info("=====================")
+                        ollama_response = _loads(response_body)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"\n=== Ollama Response ===\n{_dumps(ollama_response, indent=True)}\n=====================")
 
                         response_text = ollama_response.get("response", "").strip()
-                        response_text = re.sub(r'<[^>]+>', '', response_text)
-                        response_text = response_text.replace("[/INST]", "").replace("[INST]", "").replace("<<SYS>>", "").replace("<</SYS>>", "").replace("</s>", "")
-                        response_text = "\n".join(line.strip() for line in response_text.splitlines() if line.strip()) or "Empty response"
+                        response_text = _TAG_RE.sub('', response_text)
+                        response_text = _MARKERS_RE.sub('', response_text)
+                        response_text = "\n".join(filter(None, (line.strip() for line in response_text.splitlines()))) or "Empty response"
 
                         openai_response = {
                             "id": f"chat-{int(time.time())}",
@@ -366,61 +548,159 @@ class CORSProxyHandler(http.server.BaseHTTPRequestHandler):
                                 "total_tokens": -1
                             }
                         }
-                        logger.info("\n=== Transformed Response ===")
-                        logger.info(json.dumps(openai_response, indent=2))
-                        logger.info("=========================")
-
-                        response_json = json.dumps(openai_response)
-                        self.send_response(200)
-                        self.send_cors_headers()
-                        self.send_header('Content-Type', 'application/json')
-                        self.send_header('Content-Length', str(len(response_json.encode('utf-8'))))
-                        self.end_headers()
-                        self.wfile.write(response_json.encode('utf-8'))
-                        self.wfile.flush()
-                    except json.JSONDecodeError as e:
-                        logger.error(f"\n=== Error Parsing Response ===\nResponse: {response_body}\nError: {e}\n===========================")
-                        error_response = {
-                            "error": {
-                                "message": f"Invalid response from Ollama: {str(e)}",
-                                "type": "server_error",
-                                "code": 500
-                            }
-                        }
-                        error_json = json.dumps(error_response)
-                        self.send_response(500)
-                        self.send_cors_headers()
-                        self.send_header('Content-Type', 'application/json')
-                        self.send_header('Content-Length', str(len(error_json.encode('utf-8'))))
-                        self.end_headers()
-                        self.wfile.write(error_json.encode('utf-8'))
-                        self.wfile.flush()
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"\n=== Transformed Response ===\n{_dumps(openai_response, indent=True)}\n=========================")
+
+                        self._send_json(200, orjson.dumps(openai_response))
+                    except orjson.JSONDecodeError as e:
+                        logger.error(f"\n=== Error Parsing Response ===\nResponse: {response_body!r}\nError: {e}\n===========================")
+                        self._send_error(500, f"Invalid response from Ollama: {str(e)}", "server_error")
+        except ConnectionRefusedError:
+            self._send_error(503, "Ollama is not running", "service_unavailable")
         except Exception as e:
             logger.error(f"\n=== Proxy Error ===\n{str(e)}\n==================")
-            error_response = {
-                "error": {
-                    "message": f"Proxy error: {str(e)}",
-                    "type": "server_error",
-                    "code": 500
-                }
-            }
-            error_json = json.dumps(error_response)
-            self.send_response(500)
-            self.send_cors_headers()
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Content-Length', str(len(error_json.encode('utf-8'))))
-            self.end_headers()
-            self.wfile.write(error_json.encode('utf-8'))
-            self.wfile.flush()
+            self._send_error(500, f"Proxy error: {str(e)}", "server_error")
 
 
-def is_ollama_running():
-    """Check if Ollama is running"""
+class ProxyServer(http.server.ThreadingHTTPServer):
+    """ThreadingHTTPServer that handles connections on a fixed set of worker threads
+
+    Long-lived workers keep their thread-local Ollama connection between clients,
+    and being daemon threads they let Ctrl+C exit without waiting for in-flight
+    generations to finish.
+    """
+
+    # Socket options are applied in server_bind during __init__, so they must be class attributes
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, max_workers=None) -> None:
+        self.max_workers = max_workers or CONFIG["max_workers"]
+        self.workers: List[Thread] = []
+        self.pending: "queue.Queue[Tuple[Any, Any]]" = queue.Queue()
+        super().__init__(server_address, handler_class)
+
+    def server_bind(self):
+        """Enable SO_REUSEPORT when configured, before the socket is bound"""
+        if CONFIG["reuse_port"] and SO_REUSEPORT is not None:
+            self.socket.setsockopt(SOL_SOCKET, SO_REUSEPORT, 1)
+        super().server_bind()
+
+    def process_request(self, request, client_address):
+        """Queue the connection for a worker, starting workers up to max_workers"""
+        if len(self.workers) < self.max_workers:
+            worker = Thread(target=self._worker, name=f"dcopt-worker-{len(self.workers)}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        self.pending.put((request, client_address))
+
+    def _worker(self):
+        while True:
+            request, client_address = self.pending.get()
+            self.process_request_thread(request, client_address)
+
+
+class UnixProxyServer(ProxyServer):
+    """ProxyServer listening on a Unix domain socket, used as the SSH tunnel target"""
+
+    address_family = getattr(socket_module, "AF_UNIX", AF_INET)
+    allow_reuse_address = False
+
+    def server_bind(self):
+        # HTTPServer.server_bind expects a (host, port) address, so bind the path directly
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)  # Stale socket from a crashed run
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = CONFIG["proxy_port"]
+
+    def get_request(self):
+        # Unix peers have no address; the handler's log line indexes client_address[0]
+        request, _ = self.socket.accept()
+        return request, ("unix", 0)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def start_uds_server():
+    """Serve the proxy on a Unix socket so the SSH tunnel skips the TCP loopback hop"""
+    if not HAS_UNIX_SOCKETS:
+        return None
+    path = os.path.join(tempfile.gettempdir(), f"dcopt-{os.getpid()}.sock")
     try:
-        with urllib.request.urlopen(CONFIG["ollama_url"], timeout=2):
-            return True
-    except Exception:
+        server = UnixProxyServer(path, CORSProxyHandler)
+    except OSError as e:
+        logger.warning(f"Unix socket unavailable ({e}), SSH tunnel will use TCP")
+        return None
+    Thread(target=server.serve_forever, daemon=True).start()
+    CONFIG["uds_path"] = path
+    return server
+
+
+def is_ollama_running(ttl=5.0):
+    """Check if Ollama is running, trusting a successful probe for ttl seconds
+
+    The probe is a bare HTTP/1.0 GET of Ollama's root (over TLS for an https
+    ollama_url), which answers with the plain text "Ollama is running". Failures
+    are never cached so startup polling sees Ollama come up immediately.
+    """
+    global _ollama_seen_at
+    now = time.monotonic()
+    if _ollama_seen_at is not None and now - _ollama_seen_at < ttl:
+        return True
+    url = urllib.parse.urlsplit(CONFIG["ollama_url"])
+    https = url.scheme == "https"
+    try:
+        with create_connection((url.hostname, url.port or (443 if https else 80)), timeout=0.2) as raw:
+            raw.settimeout(2)  # Connecting is instant locally; a busy Ollama may take longer to answer
+            if https:
+                import ssl
+                sock = ssl.create_default_context().wrap_socket(raw, server_hostname=url.hostname)
+            else:
+                sock = raw
+            with sock:
+                sock.sendall(b"GET / HTTP/1.0\r\nHost: %s\r\n\r\n" % url.netloc.encode('ascii'))
+                reply = b""
+                while len(reply) < 1024:
+                    data = sock.recv(1024)
+                    if not data:
+                        break
+                    reply += data
+    except OSError:
         return False
+    if b"Ollama is running" not in reply:
+        return False
+    _ollama_seen_at = now
+    return True
+
+
+_models_cache: Tuple[float, Optional[List[str]]] = (0.0, None)  # (monotonic timestamp, model names) from /api/tags
+
+
+def _get_models_cached(ttl=5.0):
+    """Return installed model names from Ollama's /api/tags, cached for ttl seconds"""
+    global _models_cache
+    fetched_at, models = _models_cache
+    now = time.monotonic()
+    if models is not None and now - fetched_at < ttl:
+        return models
+    with _ollama_request("GET", "/api/tags") as response:
+        data = response.read()
+    if response.status >= 400:
+        raise http.client.HTTPException(f"Ollama returned {response.status} for /api/tags")
+    models = [model["name"] for model in _loads(data).get("models", [])]
+    _models_cache = (now, models)
+    return models
+
+
+def _invalidate_models_cache():
+    """Force the next _get_models_cached call to refetch from Ollama"""
+    global _models_cache
+    _models_cache = (0.0, None)
 
 
 def start_ollama():
@@ -428,34 +708,78 @@ def start_ollama():
     if is_ollama_running():
         return True
     logger.info("Starting Ollama server...")
+    # Ollama logs every request, so its output goes to a file rather than a pipe nobody
+    # drains; its own session keeps Ctrl+C on the proxy from also killing Ollama.
+    # The log lives in the user's Ollama directory and is truncated on every start.
+    log_path = os.path.join(os.path.expanduser("~"), ".ollama", "logs", "dcopt-serve.log")
     try:
-        process = subprocess.Popen(["ollama", "serve"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
-        for _ in range(10):
-            time.sleep(0.5)
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with open(log_path, "wb") as log:
+            if sys.platform == 'win32':
+                process = subprocess.Popen(
+                    ["ollama", "serve"], stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
+                )
+            else:
+                process = subprocess.Popen(
+                    ["ollama", "serve"], stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
+        for attempt in range(12):
+            time.sleep(_backoff(attempt))
             if is_ollama_running():
-                logger.info("✓ Ollama started successfully")
+                logger.info(f"✓ Ollama started successfully (log: {log_path})")
                 return True
-        stderr = process.stderr.read().decode()
-        logger.error(f"Failed to start Ollama: {stderr}")
+            if process.poll() is not None:
+                break
+        with open(log_path, "rb") as log:
+            log.seek(max(0, os.path.getsize(log_path) - 2048))
+            tail = log.read().decode('utf-8', 'replace')
+        logger.error(f"Failed to start Ollama: {tail}")
         return False
     except Exception as e:
         logger.error(f"Error starting Ollama: {e}")
         return False
 
 
+def _model_exists(model_name):
+    """Check whether Ollama has the model, resolving tags the same way a pull would"""
+    models = _get_models_cached()
+    if model_name in models or f"{model_name}:latest" in models:
+        return True
+    with _ollama_request("POST", "/api/show", orjson.dumps({"model": model_name})) as response:
+        response.read()
+    return response.status == 200
+
+
 def pull_model(model_name):
     """Pull the model if needed"""
     try:
-        result = subprocess.run(["ollama", "list"], capture_output=True, text=True, shell=True)
-        if model_name in result.stdout:
+        if _model_exists(model_name):
             logger.info(f"✓ Model {model_name} already available")
             return True
         logger.info(f"Pulling model {model_name}...")
-        result = subprocess.run(["ollama", "pull", model_name], capture_output=True, text=True, shell=True)
-        if result.returncode == 0:
-            logger.info(f"✓ Successfully pulled {model_name}")
-            return True
-        logger.error(f"Failed to pull {model_name}: {result.stderr}")
+        body = orjson.dumps({"model": model_name, "stream": True})
+        with _ollama_request("POST", "/api/pull", body) as response:
+            if response.status >= 400:
+                logger.error(f"Failed to pull {model_name}: {response.read().decode('utf-8', 'replace')}")
+                return False
+            # Progress records arrive as NDJSON; finish as soon as Ollama reports success
+            last_status = None
+            for records in _iter_ndjson(response, CONFIG["chunk_size"]):
+                for record in records:
+                    if "error" in record:
+                        logger.error(f"Failed to pull {model_name}: {record['error']}")
+                        return False
+                    status = record.get("status")
+                    if status == "success":
+                        _invalidate_models_cache()
+                        logger.info(f"✓ Successfully pulled {model_name}")
+                        return True
+                    if status != last_status:
+                        logger.info(f"  {status}")
+                        last_status = status
+        logger.error(f"Failed to pull {model_name}: stream ended without success")
         return False
     except Exception as e:
         logger.error(f"Error pulling model: {e}")
@@ -467,27 +791,32 @@ def start_ngrok(port):
     logger.info("Starting ngrok tunnel...")
     try:
         cmd = ["ngrok", "http", str(port), "--authtoken", CONFIG["ngrok_authtoken"], "--log", "stdout", "--log-format", "json"]
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, shell=True)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
         start_time = time.time()
         while time.time() - start_time < 10:
             line = process.stdout.readline()
-            if line:
-                try:
-                    log_data = json.loads(line)
-                    if "url" in log_data:
-                        url = log_data.get("url", '')
-                        https_url = url.replace('http://', 'https://')
-                        logger.info("✓ Ngrok tunnel established")
-                        logger.info(f"  HTTP:  {url}")
-                        logger.info(f"  HTTPS: {https_url}")
-                        return url
-                except json.JSONDecodeError:
-                    continue
+            if not line:
+                break  # ngrok exited; stop instead of spinning on EOF
+            try:
+                log_data = _loads(line)
+                if "url" in log_data:
+                    url = log_data.get("url", '')
+                    https_url = url.replace('http://', 'https://')
+                    logger.info("✓ Ngrok tunnel established")
+                    logger.info(f"  HTTP:  {url}")
+                    logger.info(f"  HTTPS: {https_url}")
+                    return url
+            except orjson.JSONDecodeError:
+                continue
 
-        # Fallback to ngrok API
-        time.sleep(2)
-        with urllib.request.urlopen("http://127.0.0.1:4040/api/tunnels") as response:
-            tunnels = json.loads(response.read().decode())
+        # Fallback to ngrok API, which may need a moment to come up
+        for attempt in range(6):
+            time.sleep(_backoff(attempt, base=0.25))
+            try:
+                with urllib.request.urlopen("http://127.0.0.1:4040/api/tunnels", timeout=2) as response:
+                    tunnels = _loads(response.read())
+            except urllib.error.URLError:
+                continue
             if tunnels["tunnels"]:
                 return tunnels["tunnels"][0]["public_url"]
 
@@ -501,8 +830,23 @@ def start_ngrok(port):
         return None
 
 
-def start_paramiko_tunnel():
-    """Start SSH tunnel using Paramiko"""
+def load_ssh_key():
+    """Import paramiko and read the configured key file, if any
+
+    Run in the background while the model is pulled, so the tunnel step starts warm.
+    """
+    import paramiko
+    if not CONFIG["ssh_key_file"]:
+        return None
+    return paramiko.RSAKey.from_private_key_file(CONFIG["ssh_key_file"])
+
+
+def start_paramiko_tunnel(key_future=None):
+    """Start SSH tunnel using Paramiko, optionally with a key preloaded by load_ssh_key"""
+    # Imported here so only SSH launches pay for paramiko and cryptography; an
+    # ImportError lets start_ssh_tunnel fall back to the system SSH client
+    import paramiko
+
     logger.info("Starting Paramiko SSH tunnel...")
     
     try:
@@ -513,7 +857,10 @@ def start_paramiko_tunnel():
         # Connect using either password or key file
         if CONFIG["ssh_key_file"]:
             try:
-                private_key = paramiko.RSAKey.from_private_key_file(CONFIG["ssh_key_file"])
+                if key_future is not None:
+                    private_key = key_future.result()
+                else:
+                    private_key = paramiko.RSAKey.from_private_key_file(CONFIG["ssh_key_file"])
                 ssh.connect(
                     CONFIG["ssh_host"],
                     port=CONFIG["ssh_port"],
@@ -556,8 +903,12 @@ def start_paramiko_tunnel():
 
             def handler(chan):
                 try:
-                    sock = socket(AF_INET, SOCK_STREAM)
-                    sock.connect(("127.0.0.1", CONFIG["proxy_port"]))
+                    if CONFIG["uds_path"]:
+                        sock = socket(socket_module.AF_UNIX, SOCK_STREAM)
+                        sock.connect(CONFIG["uds_path"])
+                    else:
+                        sock = socket(AF_INET, SOCK_STREAM)
+                        sock.connect(("127.0.0.1", CONFIG["proxy_port"]))
                     
                     def forward(source, destination):
                         try:
@@ -603,13 +954,13 @@ def start_paramiko_tunnel():
         return False
 
 
-def start_ssh_tunnel():
+def start_ssh_tunnel(key_future=None):
     """Start SSH tunnel using either Paramiko or system SSH"""
     logger.info("Starting SSH tunnel...")
     
     # Try Paramiko first
     try:
-        if start_paramiko_tunnel():
+        if start_paramiko_tunnel(key_future):
             return True
     except Exception as e:
         logger.warning(f"Paramiko failed: {e}, falling back to system SSH")
@@ -630,10 +981,11 @@ def start_ssh_tunnel():
             ]
             logger.info("Using plink for Windows SSH connection")
         else:
-            # Use traditional SSH for Unix-like systems
+            # Use traditional SSH for Unix-like systems (OpenSSH 6.7+ forwards to a Unix socket)
+            local_target = CONFIG["uds_path"] or f"127.0.0.1:{CONFIG['proxy_port']}"
             ssh_cmd = [
                 "ssh", "-N", 
-                "-R", f"{CONFIG['ssh_remote_port']}:127.0.0.1:{CONFIG['proxy_port']}",
+                "-R", f"{CONFIG['ssh_remote_port']}:{local_target}",
                 "-o", "StrictHostKeyChecking=no",
                 "-o", "ExitOnForwardFailure=yes",
                 "-o", "GatewayPorts=yes",
@@ -676,30 +1028,36 @@ def start_ssh_tunnel():
 def list_ollama_models():
     """List available Ollama models and return them"""
     try:
-        result = subprocess.run(["ollama", "list"], capture_output=True, text=True, shell=True)
-        if result.returncode == 0:
-            models = []
-            # Skip header line and process each model line
-            for line in result.stdout.splitlines()[1:]:
-                if line.strip():
-                    model_name = line.split()[0]
-                    models.append(model_name)
-            return models
-        return []
+        return list(_get_models_cached())
     except Exception as e:
         logger.error(f"Error listing models: {e}")
         return []
 
 
+# Header box, pre-rendered so print_header issues a single log call
+_HEADER_TOP = (
+    f"\n{Colors.HEADER}╔════════════════════════════════════════════════════════════╗{Colors.ENDC}\n"
+    f"{Colors.HEADER}║{Colors.BOLD}                                                            {Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}\n"
+    f"{Colors.HEADER}║{Colors.BOLD}                         DCOPT                              {Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}\n"
+    f"{Colors.HEADER}║{Colors.BOLD}                                                            {Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}\n"
+)
+_HEADER_SUBTITLE_TMPL = f"{Colors.HEADER}║{Colors.BOLD}          {{}}{Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}\n"
+_HEADER_BOTTOM = f"{Colors.HEADER}╚════════════════════════════════════════════════════════════╝{Colors.ENDC}\n"
+
+_SETUP_STEPS = "\n".join(f"  {bold(f'{i}.')} {step}" for i, step in enumerate((
+    "Open Cursor Settings (Ctrl + ,)",
+    "Go to Models tab",
+    "Set 'Override OpenAI Base URL' to the Base URL above",
+    "Set 'OpenAI API Key' to 'ollama'",
+    "Set 'Override chat model' to the Model above",
+    "Save and test with a simple chat message",
+), 1))
+
+
 def print_header(title, subtitle=None):
     """Print a formatted header with optional subtitle"""
-    logger.info(f"\n{Colors.HEADER}╔════════════════════════════════════════════════════════════╗{Colors.ENDC}")
-    logger.info(f"{Colors.HEADER}║{Colors.BOLD}                                                            {Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}")
-    logger.info(f"{Colors.HEADER}║{Colors.BOLD}                         DCOPT                              {Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}")
-    logger.info(f"{Colors.HEADER}║{Colors.BOLD}                                                            {Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}")
-    if subtitle:
-        logger.info(f"{Colors.HEADER}║{Colors.BOLD}          {subtitle.center(44)}{Colors.ENDC}{Colors.HEADER}║{Colors.ENDC}")
-    logger.info(f"{Colors.HEADER}╚════════════════════════════════════════════════════════════╝{Colors.ENDC}\n")
+    subtitle_line = _HEADER_SUBTITLE_TMPL.format(subtitle.center(44)) if subtitle else ""
+    logger.info(_HEADER_TOP + subtitle_line + _HEADER_BOTTOM)
 
 def print_section(title):
     """Print a section title"""
@@ -730,13 +1088,14 @@ def select_model():
     print_header("MODEL SELECTION")
     print_section("Available Models")
     
-    for i, model in enumerate(available_models, 1):
-        logger.info(f"  {Colors.BOLD}{i}.{Colors.ENDC} {model}")
-    
+    logger.info("\n".join(f"  {bold(f'{i}.')} {model}" for i, model in enumerate(available_models, 1)))
+
     print_section("Options")
-    logger.info(f"  {Colors.BOLD}•{Colors.ENDC} Enter a number to select an available model")
-    logger.info(f"  {Colors.BOLD}•{Colors.ENDC} Enter a model name to pull a new model")
-    logger.info(f"  {Colors.BOLD}•{Colors.ENDC} Press Enter to use default (deepseek-r1:7b)")
+    logger.info(
+        f"  {bold('•')} Enter a number to select an available model\n"
+        f"  {bold('•')} Enter a model name to pull a new model\n"
+        f"  {bold('•')} Press Enter to use default (deepseek-r1:7b)"
+    )
     
     choice = input(f"\n{Colors.BLUE}Your choice: {Colors.ENDC}").strip()
     
@@ -752,6 +1111,17 @@ def select_model():
     
     return choice
 
+def positive_int(value):
+    """argparse type for options that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description="DCOPT - Deviance's Cursor Ollama Proxy Thingy")
@@ -760,6 +1130,9 @@ def main():
     parser.add_argument('--start-ollama', action='store_true', help='Start Ollama if not running')
     parser.add_argument('--use-ngrok', action='store_true', help='Enable ngrok tunneling (disabled by default)')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    parser.add_argument('--max-workers', type=positive_int, default=CONFIG["max_workers"], help='Maximum concurrent client connections handled by the proxy (default: 16)')
+    parser.add_argument('--reuse-port', action='store_true', help='Set SO_REUSEPORT so multiple proxy processes can share the port (Linux/macOS)')
+    parser.add_argument('--chunk-size', type=positive_int, default=CONFIG["chunk_size"], help='Read size in bytes for streamed Ollama responses (default: 65536)')
     
     # SSH options
     ssh_group = parser.add_argument_group('SSH Tunneling')
@@ -782,7 +1155,13 @@ def main():
         logger.setLevel(logging.DEBUG)
 
     CONFIG["proxy_port"] = args.port
+    CONFIG["chunk_size"] = args.chunk_size
+    CONFIG["max_workers"] = args.max_workers
+    # Applies to every thread started from here on: proxy workers and tunnel forwarders
+    threading.stack_size(CONFIG["thread_stack_size"])
+    CONFIG["reuse_port"] = args.reuse_port
     CONFIG["use_ngrok"] = args.use_ngrok
+    CONFIG["start_ollama"] = args.start_ollama
     
     # Update SSH config
     if args.use_ssh:
@@ -822,12 +1201,16 @@ def main():
     print_section("Model Setup")
     if args.model:
         CONFIG["model_name"] = args.model
-        logger.info(f"Using specified model: {Colors.BOLD}{CONFIG['model_name']}{Colors.ENDC}")
+        logger.info(f"Using specified model: {bold(CONFIG['model_name'])}")
     else:
         CONFIG["model_name"] = select_model()
     
-    logger.info(f"\nPulling model {Colors.BOLD}{CONFIG['model_name']}{Colors.ENDC}...")
-    if not pull_model(CONFIG["model_name"]):
+    logger.info(f"\nPulling model {bold(CONFIG['model_name'])}...")
+    # Warm up the SSH side while the pull runs; errors surface when the tunnel starts
+    with ThreadPoolExecutor(max_workers=1) as startup:
+        key_future = startup.submit(load_ssh_key) if CONFIG["use_ssh"] else None
+        model_ready = pull_model(CONFIG["model_name"])
+    if not model_ready:
         print_error(f"Failed to pull model {CONFIG['model_name']}")
         sys.exit(1)
     print_success(f"Model {CONFIG['model_name']} is ready")
@@ -835,8 +1218,11 @@ def main():
     # Handle tunneling
     if CONFIG["use_ssh"]:
         print_section("SSH Tunnel Setup")
-        if not start_ssh_tunnel():
+        uds_server = start_uds_server()
+        if not start_ssh_tunnel(key_future):
             print_error("SSH tunnel setup failed")
+            if uds_server:
+                uds_server.server_close()
             sys.exit(1)
     elif CONFIG["use_ngrok"]:
         print_section("Ngrok Tunnel Setup")
@@ -846,8 +1232,7 @@ def main():
 
     # Start server
     try:
-        server = http.server.ThreadingHTTPServer(("", CONFIG["proxy_port"]), CORSProxyHandler)
-        server.allow_reuse_address = True
+        server = ProxyServer(("", CONFIG["proxy_port"]), CORSProxyHandler)
         print_success("Proxy server started successfully")
 
         # Print configuration info
@@ -862,22 +1247,21 @@ def main():
         print_section("Cursor Configuration")
         
         print_section("Connection Details")
-        logger.info(f"  Base URL: {Colors.BOLD}{base_url}{Colors.ENDC}")
-        logger.info(f"  API Key:  {Colors.BOLD}ollama{Colors.ENDC}")
-        logger.info(f"  Model:    {Colors.BOLD}{CONFIG['model_name']}{Colors.ENDC}")
+        logger.info(
+            f"  Base URL: {bold(base_url)}\n"
+            f"  API Key:  {bold('ollama')}\n"
+            f"  Model:    {bold(CONFIG['model_name'])}"
+        )
         
         if CONFIG["use_ssh"]:
-            logger.info(f"\n  SSH tunnel: {Colors.BOLD}{CONFIG['ssh_host']}:{CONFIG['ssh_remote_port']} -> localhost:{CONFIG['proxy_port']}{Colors.ENDC}")
+            local_target = CONFIG["uds_path"] or f"localhost:{CONFIG['proxy_port']}"
+            tunnel = f"{CONFIG['ssh_host']}:{CONFIG['ssh_remote_port']} -> {local_target}"
+            logger.info(f"\n  SSH tunnel: {bold(tunnel)}")
         elif ngrok_url:
             print_warning("Ngrok URL changes on restart. Update Cursor settings if needed.")
         
         print_section("Setup Steps")
-        logger.info(f"  {Colors.BOLD}1.{Colors.ENDC} Open Cursor Settings (Ctrl + ,)")
-        logger.info(f"  {Colors.BOLD}2.{Colors.ENDC} Go to Models tab")
-        logger.info(f"  {Colors.BOLD}3.{Colors.ENDC} Set 'Override OpenAI Base URL' to the Base URL above")
-        logger.info(f"  {Colors.BOLD}4.{Colors.ENDC} Set 'OpenAI API Key' to 'ollama'")
-        logger.info(f"  {Colors.BOLD}5.{Colors.ENDC} Set 'Override chat model' to the Model above")
-        logger.info(f"  {Colors.BOLD}6.{Colors.ENDC} Save and test with a simple chat message")
+        logger.info(_SETUP_STEPS)
         
         print_success("Setup complete - Server is running")
         logger.info(f"\n{Colors.YELLOW}Press Ctrl+C to stop the server...{Colors.ENDC}")
@@ -890,6 +1274,8 @@ def main():
     finally:
         if 'server' in locals():
             server.server_close()
+        if 'uds_server' in locals() and uds_server:
+            uds_server.server_close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Optional build script for DCOPT.
+
+Running DCOPT never requires this: `python ollama_for_cursor.py` works as-is.
+If mypyc is installed (`pip install mypy`), the proxy module is compiled to a
+C extension, which Python picks over the .py file on import:
+
+    python setup.py build_ext --inplace      # compile next to the source
+    pip install --no-build-isolation .       # or install with a `dcopt` command
+
+A plain `pip install .` builds in an isolated environment without mypy, and
+like any build without mypyc it installs the pure-Python module unchanged.
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = mypycify(["--ignore-missing-imports", "ollama_for_cursor.py"])
+
+setup(
+    name="dcopt",
+    version="1.0.0",
+    description="DCOPT - Deviance's Cursor Ollama Proxy Thingy",
+    author="Deviance",
+    license="MIT",
+    python_requires=">=3.7",
+    py_modules=["ollama_for_cursor"],
+    ext_modules=ext_modules,
+    install_requires=[
+        "colorama>=0.4.6",
+        "orjson>=3.9.0",
+        "paramiko>=3.4.0",
+        "pyngrok>=7.0.0",
+        "cryptography>=42.0.0",
+    ],
+    entry_points={
+        "console_scripts": ["dcopt = ollama_for_cursor:main"],
+    },
+)